@@ -3,11 +3,12 @@ from location import (Location, manhattan_distance, deserialize_location)
 from container import PriorityQueue
 from rider import Rider, WAITING, CANCELLED, SATISFIED
 from driver import Driver
-from dispatcher import Dispatcher
+from dispatcher import Dispatcher, GRID_THRESHOLD
 from event import (RiderRequest, DriverRequest, Pickup, Dropoff, Cancellation,
                    create_event_list)
-from monitor import Activity, Monitor, DRIVER, RIDER, REQUEST, CANCEL, PICKUP, \
+from monitor import Monitor, DRIVER, RIDER, REQUEST, CANCEL, PICKUP, \
     DROPOFF
+from simulation import Simulation
 
 
 def test_pq_priority_with_same_timestamp() -> None:
@@ -17,11 +18,11 @@ def test_pq_priority_with_same_timestamp() -> None:
     pq = PriorityQueue()
     dr1 = DriverRequest(0, d1)
     pq.add(dr1)
-    assert pq._items == [dr1]
+    assert pq._data == [dr1]
     dr2 = DriverRequest(0, d2)
     pq.add(dr2)
 
-    assert pq._items == [dr1, dr2]
+    assert pq._data == [dr1, dr2]
 
 
 def test_dispatcher_waiting_list() -> None:
@@ -29,9 +30,29 @@ def test_dispatcher_waiting_list() -> None:
     Tests the dispatcher waiting list is properly created
     """
     dispatch = Dispatcher()
+    bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
+    dispatch.request_driver(bobby)
     bob = Driver("bob", Location(0,0), 0)
     dispatch._driver_list = [bob]
-    bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
-    dispatch._waiting_list = [bobby]
-    assert len(dispatch._waiting_list) == 1
+    assert len(dispatch._index) == 1
+
+
+def test_grid_index_survives_reuse_cycles() -> None:
+    """
+    Tests that a fleet past the grid threshold keeps matching riders
+    through repeated pickup -> dropoff -> re-request cycles
+    """
+    events = []
+    for i in range(GRID_THRESHOLD + 4):
+        events.append(DriverRequest(0, Driver(f"d{i}", Location(i, i), 1)))
+    rider_num = 0
+    for wave_start in (5, 200, 400):
+        for i in range(6):
+            rider = Rider(f"r{rider_num}", 100,
+                          Location(i * 3, 2), Location(i * 3, 20))
+            events.append(RiderRequest(wave_start + i, rider))
+            rider_num += 1
+    report = Simulation().run(events)
+    assert report['rider_wait_time'] >= 0
+    assert report['driver_ride_distance'] > 0
 
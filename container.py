@@ -1,103 +1,497 @@
-"""Containers of objects"""
-
-
-class Container:
-    """A container that holds objects.
-
-    This is an abstract class.  Only child classes should be instantiated.
-    """
-
-    def add(self, item: object) -> None:
-        """Add <item> to this Container.
-
-        """
-        raise NotImplementedError("Implemented in a subclass")
-
-    def remove(self) -> object:
-        """Remove and return a single item from this Container.
-
-        """
-        raise NotImplementedError("Implemented in a subclass")
-
-    def is_empty(self) -> bool:
-        """Return True iff this Container is empty.
-
-        """
-        raise NotImplementedError("Implemented in a subclass")
-
-
-class PriorityQueue(Container):
-    """A queue of items that operates in priority order.
-
-    Items are removed from the queue according to priority; the item with the
-    highest priority is removed first. Ties are resolved in FIFO order,
-    meaning the item which was inserted *earlier* is the first one to be
-    removed.
-
-    Priority is defined by the rich comparison methods for the objects in the
-    container (__lt__, __le__, __gt__, __ge__).
-
-    If x < y, then x has a *HIGHER* priority than y.
-
-    All objects in the container must be of the same type.
-    """
-
-    # === Private Attributes ===
-    _items: list
-    #     The items stored in the priority queue.
-    #
-    # === Representation Invariants ===
-    # _items is a sorted list, where the first item in the queue is the
-    # item with the highest priority.
-
-    def __init__(self) -> None:
-        """Initialize an empty PriorityQueue.
-
-        """
-        self._items = []
-
-    def remove(self) -> object:
-        """Remove and return the next item from this PriorityQueue.
-
-        Precondition: <self> should not be empty.
-        >>> queue = PriorityQueue()
-        >>> queue.add("b")
-        >>> queue.add('a')
-        >>> queue.remove()
-        'a'
-        """
-        return self._items.pop(0)
-
-    def is_empty(self) -> bool:
-        """
-        Return true iff this PriorityQueue is empty.
-
-        >>> queue = PriorityQueue()
-        >>> queue.is_empty()
-        True
-        >>> queue.add("a")
-        >>> queue.is_empty()
-        False
-        """
-        return len(self._items) == 0
-
-    def add(self, item: object) -> None:
-        """Add <item> to this PriorityQueue.
-
-        >>> queue = PriorityQueue()
-        >>> queue.add("b")
-        >>> queue.add("c")
-        >>> queue.add("d")
-        >>> queue.add("a")
-        >>> queue._items
-        ['a', 'b', 'c', 'd']
-        """
-        self._items.append(item)
-        self._items.sort()
-
-
-if __name__ == '__main__':
-    import doctest
-    doctest.testmod()
-    import python_ta
-    python_ta.check_all()
+"""Containers of objects"""
+
+from heapq import heappop, heappush, merge
+
+
+class Container:
+    """A container that holds objects.
+
+    This is an abstract class.  Only child classes should be instantiated.
+    """
+
+    def add(self, item: object) -> None:
+        """Add <item> to this Container.
+
+        """
+        raise NotImplementedError("Implemented in a subclass")
+
+    def remove(self) -> object:
+        """Remove and return a single item from this Container.
+
+        """
+        raise NotImplementedError("Implemented in a subclass")
+
+    def is_empty(self) -> bool:
+        """Return True iff this Container is empty.
+
+        """
+        raise NotImplementedError("Implemented in a subclass")
+
+
+class PriorityQueue(Container):
+    """A queue of items that operates in priority order.
+
+    Items are removed from the queue according to priority; the item with the
+    highest priority is removed first.
+
+    Priority is defined by __lt__ on the objects in the container:
+    if x < y, then x has a *HIGHER* priority than y. Items that compare
+    equal may come back in any order, so callers that need FIFO ties
+    should fold a tiebreaker into the item itself, as the simulation's
+    (timestamp, counter, event) entries do.
+
+    All objects in the container must be of the same type.
+    """
+
+    # === Private Attributes ===
+    _data: list
+    #     Heap of individually added items. In the simulation only the
+    #     handful of follow-on events live here, so it stays small and
+    #     its sifts touch few cache lines.
+    _static: list
+    #     Sorted list of bulk-loaded items, consumed front to back.
+    _idx: int
+    #     Index into _static of the next unconsumed item.
+    #
+    # === Representation Invariants ===
+    # _data satisfies the binary-heap property maintained by heapq, so
+    # _data[0] is its highest-priority item.
+    # _static[_idx:] is sorted, so _static[_idx] is its highest-priority
+    # item. The queue's next item is the smaller of the two heads.
+
+    def __init__(self) -> None:
+        """Initialize an empty PriorityQueue.
+
+        """
+        self._data = []
+        self._static = []
+        self._idx = 0
+
+    def remove(self) -> object:
+        """Remove and return the next item from this PriorityQueue.
+
+        Precondition: <self> should not be empty.
+        >>> queue = PriorityQueue()
+        >>> queue.add("b")
+        >>> queue.add('a')
+        >>> queue.remove()
+        'a'
+        """
+        idx = self._idx
+        static = self._static
+        if idx < len(static):
+            data = self._data
+            if not data or static[idx] < data[0]:
+                self._idx = idx + 1
+                item = static[idx]
+                # drop the reference so consumed items can be collected
+                static[idx] = None
+                return item
+        return heappop(self._data)
+
+    def peek(self) -> object:
+        """Return the next item from this PriorityQueue without
+        removing it.
+
+        Precondition: <self> should not be empty.
+        >>> queue = PriorityQueue()
+        >>> queue.add("b")
+        >>> queue.add('a')
+        >>> queue.peek()
+        'a'
+        >>> queue.is_empty()
+        False
+        """
+        idx = self._idx
+        static = self._static
+        if idx < len(static):
+            data = self._data
+            if not data or static[idx] < data[0]:
+                return static[idx]
+        return self._data[0]
+
+    def is_empty(self) -> bool:
+        """
+        Return true iff this PriorityQueue is empty.
+
+        >>> queue = PriorityQueue()
+        >>> queue.is_empty()
+        True
+        >>> queue.add("a")
+        >>> queue.is_empty()
+        False
+        """
+        return not self._data and self._idx >= len(self._static)
+
+    def add(self, item: object) -> None:
+        """Add <item> to this PriorityQueue.
+
+        >>> queue = PriorityQueue()
+        >>> queue.add("b")
+        >>> queue.add("c")
+        >>> queue.add("d")
+        >>> queue.add("a")
+        >>> [queue.remove() for _ in range(4)]
+        ['a', 'b', 'c', 'd']
+        """
+        heappush(self._data, item)
+
+    def extend(self, items: object) -> None:
+        """Add every item in <items> to this PriorityQueue.
+
+        Bulk-loaded items go to the sorted static list: one O(n log n)
+        sort up front, then O(1) consumption, keeping the dynamic heap
+        small.
+
+        >>> queue = PriorityQueue()
+        >>> queue.extend(["b", "d", "a"])
+        >>> queue.add("c")
+        >>> [queue.remove() for _ in range(4)]
+        ['a', 'b', 'c', 'd']
+        """
+        fresh = sorted(items)
+        if self._idx < len(self._static):
+            # merge any unconsumed static items with the new batch
+            fresh = list(merge(self._static[self._idx:], fresh))
+        self._static = fresh
+        self._idx = 0
+
+
+class CalendarPriorityQueue(Container):
+    """A calendar-style priority queue for integer-timestamp items.
+
+    Items must be tuples whose first element is an integer timestamp
+    that dominates their ordering, like the simulation's
+    (timestamp, counter, event) entries. Items sharing a timestamp go
+    into one bucket, and a small heap of the distinct timestamps picks
+    the current bucket, so add and remove are amortized O(1) when
+    timestamps repeat heavily, as they do in long simulation runs.
+    """
+
+    # === Private Attributes ===
+    _buckets: dict
+    #     Maps each pending timestamp to the list of items carrying it.
+    _times: list
+    #     Heap of the distinct pending timestamps.
+    #
+    # === Representation Invariants ===
+    # _times holds exactly the keys of _buckets, and every bucket is
+    # non-empty.
+
+    def __init__(self) -> None:
+        """Initialize an empty CalendarPriorityQueue.
+
+        """
+        self._buckets = {}
+        self._times = []
+
+    def add(self, item: object) -> None:
+        """Add <item> to this CalendarPriorityQueue.
+
+        >>> queue = CalendarPriorityQueue()
+        >>> queue.add((2, 'b'))
+        >>> queue.add((1, 'a'))
+        >>> queue.remove()
+        (1, 'a')
+        """
+        timestamp = item[0]
+        bucket = self._buckets.get(timestamp)
+        if bucket is None:
+            self._buckets[timestamp] = [item]
+            heappush(self._times, timestamp)
+        else:
+            bucket.append(item)
+
+    def remove(self) -> object:
+        """Remove and return the next item from this
+        CalendarPriorityQueue.
+
+        Precondition: <self> should not be empty.
+        >>> queue = CalendarPriorityQueue()
+        >>> queue.add((1, 'a'))
+        >>> queue.add((1, 'b'))
+        >>> queue.remove()
+        (1, 'a')
+        >>> queue.remove()
+        (1, 'b')
+        >>> queue.is_empty()
+        True
+        """
+        timestamp = self._times[0]
+        bucket = self._buckets[timestamp]
+        if len(bucket) == 1:
+            item = bucket[0]
+            del self._buckets[timestamp]
+            heappop(self._times)
+        else:
+            item = min(bucket)
+            bucket.remove(item)
+        return item
+
+    def peek(self) -> object:
+        """Return the next item from this CalendarPriorityQueue without
+        removing it.
+
+        Precondition: <self> should not be empty.
+        >>> queue = CalendarPriorityQueue()
+        >>> queue.add((2, 'b'))
+        >>> queue.add((1, 'a'))
+        >>> queue.peek()
+        (1, 'a')
+        """
+        return min(self._buckets[self._times[0]])
+
+    def is_empty(self) -> bool:
+        """
+        Return true iff this CalendarPriorityQueue is empty.
+
+        >>> queue = CalendarPriorityQueue()
+        >>> queue.is_empty()
+        True
+        >>> queue.add((1, 'a'))
+        >>> queue.is_empty()
+        False
+        """
+        return not self._times
+
+    def extend(self, items: object) -> None:
+        """Add every item in <items> to this CalendarPriorityQueue.
+
+        >>> queue = CalendarPriorityQueue()
+        >>> queue.extend([(2, 'b'), (1, 'a')])
+        >>> queue.remove()
+        (1, 'a')
+        """
+        for item in items:
+            self.add(item)
+
+
+class MinMaxHeap(Container):
+    """A double-ended priority queue over comparable items.
+
+    Items on even tree levels are min-ordered and items on odd levels
+    max-ordered, so both the smallest and the largest item are
+    reachable in O(1) and removable in O(log n). Useful when a bounded
+    queue must evict its worst item as cheaply as it serves its best.
+
+    Only __lt__ is required of the items, as with PriorityQueue.
+    """
+
+    # === Private Attributes ===
+    _data: list
+    #     The items, level-ordered with the min-max heap property:
+    #     an item on a min level is <= all its descendants, an item on
+    #     a max level is >= all its descendants.
+
+    def __init__(self) -> None:
+        """Initialize an empty MinMaxHeap.
+
+        """
+        self._data = []
+
+    def is_empty(self) -> bool:
+        """Return true iff this MinMaxHeap is empty.
+
+        >>> heap = MinMaxHeap()
+        >>> heap.is_empty()
+        True
+        >>> heap.add(3)
+        >>> heap.is_empty()
+        False
+        """
+        return not self._data
+
+    def __len__(self) -> int:
+        """Return the number of items in this MinMaxHeap.
+
+        >>> heap = MinMaxHeap()
+        >>> heap.add(3)
+        >>> heap.add(1)
+        >>> len(heap)
+        2
+        """
+        return len(self._data)
+
+    def peek(self) -> object:
+        """Return the smallest item without removing it.
+
+        Precondition: <self> should not be empty.
+        >>> heap = MinMaxHeap()
+        >>> heap.add(3)
+        >>> heap.add(1)
+        >>> heap.peek()
+        1
+        """
+        return self._data[0]
+
+    def peek_max(self) -> object:
+        """Return the largest item without removing it.
+
+        Precondition: <self> should not be empty.
+        >>> heap = MinMaxHeap()
+        >>> heap.add(3)
+        >>> heap.add(1)
+        >>> heap.add(2)
+        >>> heap.peek_max()
+        3
+        """
+        data = self._data
+        if len(data) == 1:
+            return data[0]
+        if len(data) > 2 and data[1] < data[2]:
+            return data[2]
+        return data[1]
+
+    def add(self, item: object) -> None:
+        """Add <item> to this MinMaxHeap.
+
+        >>> heap = MinMaxHeap()
+        >>> for value in [5, 1, 4, 2, 3]:
+        ...     heap.add(value)
+        >>> heap.peek(), heap.peek_max()
+        (1, 5)
+        """
+        data = self._data
+        data.append(item)
+        index = len(data) - 1
+        if index == 0:
+            return
+        parent = (index - 1) >> 1
+        if _on_min_level(index):
+            if data[parent] < data[index]:
+                data[index], data[parent] = data[parent], data[index]
+                self._bubble_up_max(parent)
+            else:
+                self._bubble_up_min(index)
+        elif data[index] < data[parent]:
+            data[index], data[parent] = data[parent], data[index]
+            self._bubble_up_min(parent)
+        else:
+            self._bubble_up_max(index)
+
+    def remove(self) -> object:
+        """Remove and return the smallest item from this MinMaxHeap.
+
+        Precondition: <self> should not be empty.
+        >>> heap = MinMaxHeap()
+        >>> for value in [5, 1, 4, 2, 3]:
+        ...     heap.add(value)
+        >>> [heap.remove() for _ in range(5)]
+        [1, 2, 3, 4, 5]
+        """
+        data = self._data
+        item = data[0]
+        last = data.pop()
+        if data:
+            data[0] = last
+            self._trickle_down(0)
+        return item
+
+    def remove_max(self) -> object:
+        """Remove and return the largest item from this MinMaxHeap.
+
+        Precondition: <self> should not be empty.
+        >>> heap = MinMaxHeap()
+        >>> for value in [5, 1, 4, 2, 3]:
+        ...     heap.add(value)
+        >>> [heap.remove_max() for _ in range(5)]
+        [5, 4, 3, 2, 1]
+        """
+        data = self._data
+        if len(data) == 1:
+            return data.pop()
+        index = 1
+        if len(data) > 2 and data[1] < data[2]:
+            index = 2
+        item = data[index]
+        last = data.pop()
+        if index < len(data):
+            data[index] = last
+            self._trickle_down(index)
+        return item
+
+    def _bubble_up_min(self, index: int) -> None:
+        """Move the item at <index>, on a min level, up through its
+        grandparents until the min levels above it are in order.
+        """
+        data = self._data
+        while index > 2:
+            grandparent = (((index - 1) >> 1) - 1) >> 1
+            if data[index] < data[grandparent]:
+                data[index], data[grandparent] = (data[grandparent],
+                                                  data[index])
+                index = grandparent
+            else:
+                return
+
+    def _bubble_up_max(self, index: int) -> None:
+        """Move the item at <index>, on a max level, up through its
+        grandparents until the max levels above it are in order.
+        """
+        data = self._data
+        while index > 2:
+            grandparent = (((index - 1) >> 1) - 1) >> 1
+            if data[grandparent] < data[index]:
+                data[index], data[grandparent] = (data[grandparent],
+                                                  data[index])
+                index = grandparent
+            else:
+                return
+
+    def _trickle_down(self, index: int) -> None:
+        """Restore the min-max heap property below <index> after the
+        item there was replaced.
+        """
+        data = self._data
+        size = len(data)
+        on_min = _on_min_level(index)
+        while True:
+            # the extreme descendant is among the two children and four
+            # grandchildren
+            first_child = 2 * index + 1
+            if first_child >= size:
+                return
+            best = first_child
+            candidates = range(first_child + 1, min(first_child + 2, size))
+            grandchildren = range(4 * index + 3, min(4 * index + 7, size))
+            for child in list(candidates) + list(grandchildren):
+                if on_min:
+                    if data[child] < data[best]:
+                        best = child
+                elif data[best] < data[child]:
+                    best = child
+            swap = (data[best] < data[index] if on_min
+                    else data[index] < data[best])
+            if best > 2 * index + 2:
+                # best is a grandchild
+                if swap:
+                    data[index], data[best] = data[best], data[index]
+                    parent = (best - 1) >> 1
+                    if (data[parent] < data[best] if on_min
+                            else data[best] < data[parent]):
+                        data[best], data[parent] = (data[parent],
+                                                    data[best])
+                    index = best
+                else:
+                    return
+            else:
+                if swap:
+                    data[index], data[best] = data[best], data[index]
+                return
+
+
+def _on_min_level(index: int) -> bool:
+    """Return True iff heap position <index> sits on a min level,
+    that is, at even depth.
+
+    >>> _on_min_level(0), _on_min_level(1), _on_min_level(3)
+    (True, False, True)
+    """
+    return ((index + 1).bit_length() & 1) == 1
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import doctest
+    doctest.testmod()
+    import python_ta
+    python_ta.check_all()
@@ -1,150 +1,495 @@
-"""Dispatcher for the simulation"""
-
-from typing import Optional
-from driver import Driver
-from rider import Rider, CANCELLED
-
-
-class Dispatcher:
-    """A dispatcher fulfills requests from riders and drivers for a
-    ride-sharing service.
-
-    When a rider requests a driver, the dispatcher assigns a driver to the
-    rider. If no driver is available, the rider is placed on a waiting
-    list for the next available driver. A rider that has not yet been
-    picked up by a driver may cancel their request.
-
-    When a driver requests a rider, the dispatcher assigns a rider from
-    the waiting list to the driver. If there is no rider on the waiting list
-    the dispatcher does nothing. Once a driver requests a rider, the driver
-    is registered with the dispatcher, and will be used to fulfill future
-    rider requests.
-
-    """
-    # === Private Attributes ===
-    _waiting_list: list
-    #     A list of all waiting riders
-    _driver_list: list
-
-    #     A list of all drivers
-
-    def __init__(self) -> None:
-        """Initialize a Dispatcher.
-        """
-        self._waiting_list = []
-        self._driver_list = []
-
-    def __str__(self) -> str:
-        """Return a string representation.
-        >>> from location import Location
-        >>> dispatch = Dispatcher()
-        >>> bob = Driver("bob", Location(0,0), 0)
-        >>> dispatch._driver_list = [bob]
-        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
-        >>> dispatch._waiting_list = [bobby]
-        >>> print(dispatch)
-        Total Drivers: 1
-        Total Waiting Riders: 1
-        """
-        return (f"Total Drivers: {len(self._driver_list)}" + "\n"
-                + f"Total Waiting Riders: {len(self._waiting_list)}")
-
-    def request_driver(self, rider: Rider) -> Optional[Driver]:
-        """Return a driver for the rider, or None if no driver is available.
-
-        Add the rider to the waiting list if there is no available driver.
-        >>> from location import Location
-        >>> dispatch = Dispatcher()
-        >>> bob = Driver("bob", Location(0,0), 1)
-        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
-        >>> dispatch._driver_list.append(bob)
-        >>> dispatch.request_driver(bobby).id
-        'bob'
-        >>> dispatch2 = Dispatcher()
-        >>> bobby2 = Rider("bobby2", 0, Location(0,0), Location(1, 0))
-        >>> dispatch2.request_driver(bobby2) is None
-        True
-        >>> dispatch3 = Dispatcher()
-        >>> bob2 = Driver('bob2', Location(0,0), 1)
-        >>> bob = Driver("bob", Location(0,0), 1)
-        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
-        >>> dispatch3._driver_list.append(bob2)
-        >>> dispatch3._driver_list.append(bob)
-        >>> dispatch3.request_driver(bobby).id
-        'bob2'
-        """
-        # First find the first available driver and stop the loop as soon as
-        # we find one driver that is idle
-        first_available_driver = None
-        any_available = False
-        found = 0
-        for driver in self._driver_list:
-            if driver.is_idle and found != 1:
-                first_available_driver = driver
-                any_available = True
-                found += 1
-        # If we go through the first loop and there are no drivers that are idle
-        # Then we return None and append the rider to the waiting list
-        if any_available is False:
-            self._waiting_list.append(rider)
-            return None
-        # If that forloop is not executed, then we set the closest driver to
-        # the first available driver, and we compare and find the closest
-        # driver
-        closest_driver = first_available_driver
-        for driver in self._driver_list:
-            if driver.is_idle:
-                rider_location = rider.origin
-                if (driver.get_travel_time(rider_location)
-                        < closest_driver.get_travel_time(rider_location)):
-                    closest_driver = driver
-        return closest_driver
-
-    def request_rider(self, driver: Driver) -> Optional[Rider]:
-        """Return a rider for the driver, or None if no rider is available.
-
-        If this is a new driver, register the driver for future rider requests.
-        >>> from location import Location
-        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
-        >>> bob = Driver("bob", Location(0,0), 1)
-        >>> dispatch1 = Dispatcher()
-        >>> dispatch1.request_driver(bobby)
-        >>> dispatch1.request_rider(bob).id
-        'bobby'
-        """
-        # Register the driver to the list if it's a new driver
-        if driver not in self._driver_list:
-            self._driver_list.append(driver)
-        # If there is at least 1 rider in the waiting list, pop off the first
-        # waiting rider in the list
-        if len(self._waiting_list) > 0:
-            return self._waiting_list.pop(0)
-        # Else there are no riders, and return no riders for the driver
-        else:
-            return None
-
-    def cancel_ride(self, rider: Rider) -> None:
-        """Cancel the ride for rider.
-        >>> from location import Location
-        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
-        >>> dispatch1 = Dispatcher()
-        >>> dispatch1.request_driver(bobby)
-        >>> dispatch1._waiting_list[0].id
-        'bobby'
-        >>> dispatch1.cancel_ride(bobby)
-        >>> bobby.status
-        'cancelled'
-        >>> len(dispatch1._waiting_list) == 0
-        True
-        """
-        # Change rider status to cancelled
-        # Remove the rider from the waiting list if he is in the waiting list
-        rider.status = CANCELLED
-        if rider in self._waiting_list:
-            self._waiting_list.remove(rider)
-
-
-if __name__ == '__main__':
-    import python_ta
-
-    python_ta.check_all(config={'extra-imports': ['typing', 'driver', 'rider']})
+"""Dispatcher for the simulation"""
+
+from typing import Dict, List, Optional, Tuple
+from driver import Driver
+from location import Location
+from rider import Rider, CANCELLED
+
+# The width in grid units of one cell of the dispatcher's spatial index
+GRID_CELL_SIZE = 4
+# Minimum number of idle drivers before request_driver switches from a
+# linear scan to the spatial index; below this the scan is cheaper than
+# the ring search.
+GRID_THRESHOLD = 16
+
+# An idle-driver entry: (driver, row, column, speed), snapshotted when
+# the driver becomes idle
+_IdleEntry = Tuple[Driver, int, int, int]
+
+
+class _Node:
+    """A node in the dispatcher's queue of waiting riders.
+
+    === Attributes ===
+    rider - the waiting rider stored in this node
+    prev - the previous node in the queue, or None if this is the head
+    next - the next node in the queue, or None if this is the tail
+    """
+    __slots__ = ('rider', 'prev', 'next')
+
+    rider: Rider
+    prev: Optional['_Node']
+    next: Optional['_Node']
+
+    def __init__(self, rider: Rider) -> None:
+        """Initialize a _Node holding rider.
+
+        """
+        self.rider = rider
+        self.prev = None
+        self.next = None
+
+
+class Dispatcher:
+    """A dispatcher fulfills requests from riders and drivers for a
+    ride-sharing service.
+
+    When a rider requests a driver, the dispatcher assigns a driver to the
+    rider. If no driver is available, the rider is placed on a waiting
+    list for the next available driver. A rider that has not yet been
+    picked up by a driver may cancel their request.
+
+    When a driver requests a rider, the dispatcher assigns a rider from
+    the waiting list to the driver. If there is no rider on the waiting list
+    the dispatcher does nothing. Once a driver requests a rider, the driver
+    is registered with the dispatcher, and will be used to fulfill future
+    rider requests.
+
+    """
+    __slots__ = ('_head', '_tail', '_index', '_driver_list', '_driver_ids',
+                 '_idle_drivers', '_grid', '_max_speed', '_cell_bounds')
+
+    # === Private Attributes ===
+    _head: Optional[_Node]
+    #     The first node in the waiting queue, or None if no rider is waiting
+    _tail: Optional[_Node]
+    #     The last node in the waiting queue, or None if no rider is waiting
+    _index: Dict[str, _Node]
+    #     A mapping from a waiting rider's id to the node that holds them,
+    #     so a rider can be removed from the queue in constant time
+    _driver_list: list
+    #     A list of all drivers
+    _driver_ids: set
+    #     The ids of all registered drivers, for O(1) registration checks
+    _idle_drivers: Dict[str, _IdleEntry]
+    #     A mapping from driver id to entry for drivers believed to be
+    #     idle. The coordinates and speed are snapshotted when the driver
+    #     becomes idle (idle drivers do not move), so the closest-driver
+    #     scan reads plain locals instead of chasing attributes. A driver
+    #     that went busy without the dispatcher noticing is evicted
+    #     lazily the next time request_driver meets the entry.
+    _grid: Dict[Tuple[int, int], Dict[str, _IdleEntry]]
+    #     The same entries bucketed by grid cell, so request_driver can
+    #     search outward from the rider's cell instead of scanning the
+    #     whole fleet
+    _max_speed: int
+    #     An upper bound on the speed of the idle drivers, used to bound
+    #     the best travel time a farther ring could still offer. Only
+    #     raised on insert, so it is conservative after removals; reset
+    #     when the idle mapping empties.
+    _cell_bounds: Optional[List[int]]
+
+    #     Conservative bounds [min_row, max_row, min_col, max_col] on the
+    #     occupied grid cells, used to stop the ring search. Only grown
+    #     on insert; reset when the idle mapping empties.
+
+    def __init__(self) -> None:
+        """Initialize a Dispatcher.
+        """
+        self._head = None
+        self._tail = None
+        self._index = {}
+        self._driver_list = []
+        self._driver_ids = set()
+        self._idle_drivers = {}
+        self._grid = {}
+        self._max_speed = 0
+        self._cell_bounds = None
+
+    def __str__(self) -> str:
+        """Return a string representation.
+        >>> dispatch = Dispatcher()
+        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
+        >>> dispatch.request_driver(bobby) is None
+        True
+        >>> bob = Driver("bob", Location(0,0), 0)
+        >>> dispatch._driver_list = [bob]
+        >>> print(dispatch)
+        Total Drivers: 1
+        Total Waiting Riders: 1
+        """
+        return (f"Total Drivers: {len(self._driver_list)}" + "\n"
+                + f"Total Waiting Riders: {len(self._index)}")
+
+    def _enqueue_waiting(self, rider: Rider) -> None:
+        """Add rider to the tail of the waiting queue.
+
+        """
+        node = _Node(rider)
+        if self._tail is None:
+            self._head = node
+        else:
+            self._tail.next = node
+            node.prev = self._tail
+        self._tail = node
+        self._index[rider.id] = node
+
+    def _pop_waiting(self) -> Optional[Rider]:
+        """Remove and return the rider at the head of the waiting queue,
+        or None if no rider is waiting.
+
+        """
+        node = self._head
+        if node is None:
+            return None
+        self._head = node.next
+        if self._head is None:
+            self._tail = None
+        else:
+            self._head.prev = None
+        del self._index[node.rider.id]
+        return node.rider
+
+    def _record_idle(self, driver: Driver) -> None:
+        """Snapshot driver into the idle mapping and the spatial grid.
+
+        A driver that is already recorded is removed first, so the grid
+        never keeps a second entry for them under stale coordinates.
+        """
+        if driver.id in self._idle_drivers:
+            self._remove_idle(driver.id)
+        location = driver.location
+        row = location.row
+        column = location.column
+        speed = driver.speed
+        entry = (driver, row, column, speed)
+        self._idle_drivers[driver.id] = entry
+        cell = (row // GRID_CELL_SIZE, column // GRID_CELL_SIZE)
+        self._grid.setdefault(cell, {})[driver.id] = entry
+        if self._cell_bounds is None:
+            self._max_speed = speed
+            self._cell_bounds = [cell[0], cell[0], cell[1], cell[1]]
+        else:
+            if speed > self._max_speed:
+                self._max_speed = speed
+            bounds = self._cell_bounds
+            if cell[0] < bounds[0]:
+                bounds[0] = cell[0]
+            elif cell[0] > bounds[1]:
+                bounds[1] = cell[0]
+            if cell[1] < bounds[2]:
+                bounds[2] = cell[1]
+            elif cell[1] > bounds[3]:
+                bounds[3] = cell[1]
+
+    def _remove_idle(self, driver_id: str) -> None:
+        """Remove the entry for driver_id from the idle mapping and the
+        spatial grid, if it is present.
+
+        A search can collect the same stale id from more than one grid
+        cell, so a driver_id that is already gone is not an error.
+        """
+        entry = self._idle_drivers.pop(driver_id, None)
+        if entry is None:
+            return
+        cell = (entry[1] // GRID_CELL_SIZE, entry[2] // GRID_CELL_SIZE)
+        bucket = self._grid[cell]
+        del bucket[driver_id]
+        if not bucket:
+            del self._grid[cell]
+        if not self._idle_drivers:
+            self._max_speed = 0
+            self._cell_bounds = None
+
+    def request_driver(self, rider: Rider) -> Optional[Driver]:
+        """Return a driver for the rider, or None if no driver is available.
+
+        Add the rider to the waiting list if there is no available driver.
+        >>> dispatch = Dispatcher()
+        >>> bob = Driver("bob", Location(0,0), 1)
+        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
+        >>> dispatch.request_rider(bob) is None
+        True
+        >>> dispatch.request_driver(bobby).id
+        'bob'
+        >>> dispatch2 = Dispatcher()
+        >>> bobby2 = Rider("bobby2", 0, Location(0,0), Location(1, 0))
+        >>> dispatch2.request_driver(bobby2) is None
+        True
+        >>> dispatch3 = Dispatcher()
+        >>> bob2 = Driver('bob2', Location(0,0), 1)
+        >>> bob = Driver("bob", Location(0,0), 1)
+        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
+        >>> dispatch3.request_rider(bob2) is None
+        True
+        >>> dispatch3.request_rider(bob) is None
+        True
+        >>> dispatch3.request_driver(bobby).id
+        'bob2'
+        """
+        closest_driver = self._closest_idle_driver(rider.origin)
+        # If there are no idle drivers, add the rider to the waiting list
+        if closest_driver is None:
+            self._enqueue_waiting(rider)
+            return None
+        # The chosen driver is about to start driving to the rider
+        self._remove_idle(closest_driver.id)
+        return closest_driver
+
+    def _closest_idle_driver(self, location: Location) \
+            -> Optional[Driver]:
+        """Return the idle driver with the smallest travel time to
+        location, or None if no driver is idle.
+
+        """
+        if len(self._idle_drivers) >= GRID_THRESHOLD:
+            return self._grid_search(location)
+        # For small fleets, scan the idle mapping, remembering the best
+        # travel time seen so far. The arithmetic mirrors
+        # Driver.get_travel_time but works on the snapshotted
+        # coordinates, avoiding a method call per driver. Drivers that
+        # went busy since they were recorded are evicted here.
+        row = location.row
+        column = location.column
+        closest_driver = None
+        best_time = None
+        stale = []
+        for driver, drv_row, drv_column, speed \
+                in self._idle_drivers.values():
+            if not driver.is_idle:
+                stale.append(driver.id)
+                continue
+            dx = drv_row - row
+            dy = drv_column - column
+            if dx < 0:
+                dx = -dx
+            if dy < 0:
+                dy = -dy
+            travel_time = (dx + dy + (speed >> 1)) // speed if speed else 0
+            if best_time is None or travel_time < best_time:
+                best_time = travel_time
+                closest_driver = driver
+        for driver_id in stale:
+            self._remove_idle(driver_id)
+        return closest_driver
+
+    def _grid_search(self, location: Location) -> Optional[Driver]:
+        """Return the idle driver with the smallest travel time to
+        location by expanding rings of grid cells outward from
+        location's cell, or None if no idle driver is found.
+
+        """
+        row = location.row
+        column = location.column
+        cell_row = row // GRID_CELL_SIZE
+        cell_column = column // GRID_CELL_SIZE
+        # The search never needs to leave the bounding box of occupied
+        # cells
+        bounds = self._cell_bounds
+        if bounds is None:
+            return None
+        last_ring = max(cell_row - bounds[0], bounds[1] - cell_row,
+                        cell_column - bounds[2], bounds[3] - cell_column, 0)
+        closest_driver = None
+        best_time = None
+        stale = []
+        ring = 0
+        while ring <= last_ring:
+            for cell in _ring_cells(cell_row, cell_column, ring):
+                bucket = self._grid.get(cell)
+                if bucket is None:
+                    continue
+                for driver, drv_row, drv_column, speed \
+                        in bucket.values():
+                    if not driver.is_idle:
+                        stale.append(driver.id)
+                        continue
+                    dx = drv_row - row
+                    dy = drv_column - column
+                    if dx < 0:
+                        dx = -dx
+                    if dy < 0:
+                        dy = -dy
+                    travel_time = (dx + dy + (speed >> 1)) // speed \
+                        if speed else 0
+                    if best_time is None or travel_time < best_time:
+                        best_time = travel_time
+                        closest_driver = driver
+            if best_time is not None:
+                # A driver in ring r+1 or beyond is at Manhattan distance
+                # at least ring*GRID_CELL_SIZE + 1, so the best travel
+                # time it could offer is bounded below; once that bound
+                # reaches the incumbent, no farther driver can win
+                max_speed = self._max_speed
+                if max_speed:
+                    floor_time = (ring * GRID_CELL_SIZE + 1
+                                  + (max_speed >> 1)) // max_speed
+                else:
+                    floor_time = 0
+                if floor_time >= best_time:
+                    break
+            ring += 1
+        for driver_id in stale:
+            self._remove_idle(driver_id)
+        return closest_driver
+
+    def request_drivers(self, riders: List[Rider]) \
+            -> List[Optional[Driver]]:
+        """Return a driver for each rider in riders, or None for riders
+        no driver is available for.
+
+        The riders are matched jointly, greedily assigning the pair with
+        the smallest travel time first, instead of first-come-first-serve
+        one rider at a time. Riders without a driver are added to the
+        waiting list in the order they appear in riders.
+        >>> dispatch = Dispatcher()
+        >>> bob = Driver("bob", Location(0,0), 1)
+        >>> dispatch.request_rider(bob) is None
+        True
+        >>> near = Rider("near", 0, Location(1,0), Location(5, 0))
+        >>> far = Rider("far", 0, Location(9,0), Location(5, 0))
+        >>> drivers = dispatch.request_drivers([far, near])
+        >>> drivers[0] is None
+        True
+        >>> drivers[1].id
+        'bob'
+        """
+        if len(riders) == 1:
+            return [self.request_driver(riders[0])]
+        # Collect the idle drivers, evicting stale entries
+        idle = []
+        stale = []
+        for entry in self._idle_drivers.values():
+            if entry[0].is_idle:
+                idle.append(entry)
+            else:
+                stale.append(entry[0].id)
+        for driver_id in stale:
+            self._remove_idle(driver_id)
+        # Score every rider/driver pair and assign greedily from the
+        # smallest travel time up; ties fall back to rider order, so
+        # equal-cost conflicts resolve first-come-first-serve
+        pairs = []
+        for rider_pos, rider in enumerate(riders):
+            origin = rider.origin
+            row = origin.row
+            column = origin.column
+            for driver_pos, (_, drv_row, drv_column, speed) \
+                    in enumerate(idle):
+                dx = drv_row - row
+                dy = drv_column - column
+                if dx < 0:
+                    dx = -dx
+                if dy < 0:
+                    dy = -dy
+                pairs.append(
+                    ((dx + dy + (speed >> 1)) // speed if speed else 0,
+                     rider_pos, driver_pos))
+        pairs.sort()
+        assigned: List[Optional[Driver]] = [None] * len(riders)
+        taken = [False] * len(idle)
+        unmatched = min(len(riders), len(idle))
+        for _, rider_pos, driver_pos in pairs:
+            if unmatched == 0:
+                break
+            if assigned[rider_pos] is None and not taken[driver_pos]:
+                assigned[rider_pos] = idle[driver_pos][0]
+                taken[driver_pos] = True
+                unmatched -= 1
+        for rider_pos, rider in enumerate(riders):
+            if assigned[rider_pos] is None:
+                self._enqueue_waiting(rider)
+            else:
+                # The chosen driver is about to start driving to the rider
+                self._remove_idle(assigned[rider_pos].id)
+        return assigned
+
+    def request_rider(self, driver: Driver) -> Optional[Rider]:
+        """Return a rider for the driver, or None if no rider is available.
+
+        If this is a new driver, register the driver for future rider requests.
+        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
+        >>> bob = Driver("bob", Location(0,0), 1)
+        >>> dispatch1 = Dispatcher()
+        >>> dispatch1.request_driver(bobby)
+        >>> dispatch1.request_rider(bob).id
+        'bobby'
+        """
+        # Register the driver to the list if it's a new driver
+        if driver.id not in self._driver_ids:
+            self._driver_ids.add(driver.id)
+            self._driver_list.append(driver)
+            if driver.is_idle:
+                self._record_idle(driver)
+        # Pop off the first waiting rider in the queue, or None if there
+        # are no waiting riders
+        rider = self._pop_waiting()
+        if rider is not None and driver.id in self._idle_drivers:
+            # The driver is about to start driving to the rider
+            self._remove_idle(driver.id)
+        return rider
+
+    def mark_idle(self, driver: Driver) -> None:
+        """Record that driver has become idle again.
+
+        The simulation events call this when a driver finishes a drive or
+        a ride, so that request_driver only has to consider idle drivers
+        instead of scanning every registered driver.
+        """
+        if driver.is_idle:
+            self._record_idle(driver)
+
+    def cancel_ride(self, rider: Rider) -> None:
+        """Cancel the ride for rider.
+        >>> bobby = Rider("bobby", 0, Location(0,0), Location(1, 0))
+        >>> dispatch1 = Dispatcher()
+        >>> dispatch1.request_driver(bobby)
+        >>> dispatch1._head.rider.id
+        'bobby'
+        >>> dispatch1.cancel_ride(bobby)
+        >>> bobby.status == CANCELLED
+        True
+        >>> len(dispatch1._index) == 0
+        True
+        """
+        # Change rider status to cancelled
+        # Unlink the rider's node from the waiting queue if they are waiting
+        rider.status = CANCELLED
+        node = self._index.pop(rider.id, None)
+        if node is not None:
+            if node.prev is None:
+                self._head = node.next
+            else:
+                node.prev.next = node.next
+            if node.next is None:
+                self._tail = node.prev
+            else:
+                node.next.prev = node.prev
+
+
+def _ring_cells(cell_row: int, cell_column: int, ring: int) -> list:
+    """Return the grid cells at Chebyshev distance ring from
+    (cell_row, cell_column).
+
+    >>> _ring_cells(0, 0, 0)
+    [(0, 0)]
+    >>> len(_ring_cells(0, 0, 2))
+    16
+    """
+    if ring == 0:
+        return [(cell_row, cell_column)]
+    cells = []
+    for column in range(cell_column - ring, cell_column + ring + 1):
+        cells.append((cell_row - ring, column))
+        cells.append((cell_row + ring, column))
+    for row in range(cell_row - ring + 1, cell_row + ring):
+        cells.append((row, cell_column - ring))
+        cells.append((row, cell_column + ring))
+    return cells
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import python_ta
+
+    python_ta.check_all(config={'extra-imports': ['typing', 'driver',
+                                                  'location', 'rider']})
@@ -1,137 +1,160 @@
-"""Drivers for the simulation"""
-from typing import Optional
-
-from location import Location, manhattan_distance
-from rider import Rider
-
-
-class Driver:
-    """A driver for a ride-sharing service.
-
-    === Attributes ===
-    id: A unique identifier for the driver.
-    location: The current location of the driver.
-    is_idle: True if the driver is idle and False otherwise.
-    speed: The speed of the driver
-    destination: The destination of the driver
-    """
-
-    id: str
-    location: Location
-    destination: Optional[Location]
-    is_idle: bool
-    speed: int
-
-    def __init__(self, identifier: str, location: Location, speed: int) -> None:
-        """Initialize a Driver.
-
-        """
-        self.id = identifier
-        self.location = location
-        self.speed = speed
-        self.destination = None
-        self.is_idle = True
-
-    def __str__(self) -> str:
-        """Return a string representation.
-
-        >>> driver = Driver('Bob', Location(1, 1), 1)
-        >>> str(driver)
-        'Bob'
-        """
-        return self.id
-
-    def __eq__(self, other: object) -> bool:
-        """Return True if self equals other, and false otherwise.
-
-        >>> driver1 = Driver('Bob', Location(1, 1), 1)
-        >>> driver2 = Driver('Bob', Location(1, 1), 1)
-        >>> driver1 == driver1
-        True
-        """
-        if isinstance(other, Driver):
-            return self.id == other.id
-        else:
-            return False
-
-    def get_travel_time(self, destination: Location) -> int:
-        """Return the time it will take to arrive at the destination,
-        rounded to the nearest integer.
-
-        >>> driver1 = Driver('Bob', Location(1, 1), 1)
-        >>> driver1.get_travel_time(Location(2, 2))
-        2
-        """
-        distance = manhattan_distance(self.location, destination)
-        return round(distance / self.speed)
-
-    def start_drive(self, location: Location) -> int:
-        """Start driving to the location.
-        Return the time that the drive will take.
-
-        >>> driver1 = Driver('Bob', Location(1, 1), 1)
-        >>> driver1.is_idle
-        True
-        >>> driver1.start_drive(Location(3, 3))
-        4
-        >>> driver1.is_idle
-        False
-        """
-        self.is_idle = False
-        self.destination = location
-        return self.get_travel_time(self.destination)
-
-    def end_drive(self) -> None:
-        """End the drive and arrive at the destination.
-
-        Precondition: self.destination is not None.
-
-        >>> driver1 = Driver('Bob', Location(1, 1), 1)
-        >>> driver1.start_drive(Location(3, 3))
-        4
-        >>> driver1.end_drive()
-        >>> driver1.location == Location(3, 3)
-        True
-        """
-        self.is_idle = True
-        self.location = self.destination
-        self.destination = None
-
-    def start_ride(self, rider: Rider) -> int:
-        """Start a ride and return the time the ride will take.
-
-        >>> driver1 = Driver('Bob', Location(1, 1), 1)
-        >>> rider1 = Rider("bobby", 0, Location(0,0), Location(2, 0))
-        >>> driver1.start_ride(rider1)
-        2
-        >>> driver1.location == Location(0, 0)
-        True
-        """
-        self.is_idle = False
-        self.location = rider.origin
-        self.destination = rider.destination
-        return self.get_travel_time(self.destination)
-
-    def end_ride(self) -> None:
-        """End the current ride, and arrive at the rider's destination.
-
-        Precondition: The driver has a rider.
-        Precondition: self.destination is not None.
-
-        >>> driver1 = Driver('Bob', Location(1, 1), 1)
-        >>> rider1 = Rider("bobby", 0, Location(0,0), Location(2, 0))
-        >>> driver1.start_ride(rider1)
-        2
-        >>> driver1.end_ride()
-        >>> driver1.location == Location(2, 0)
-        True
-        """
-        self.is_idle = True
-        self.location = self.destination
-        self.destination = None
-
-
-if __name__ == '__main__':
-    import python_ta
-    python_ta.check_all(
-        config={'extra-imports': ['location', 'rider']})
+"""Drivers for the simulation"""
+import sys
+
+from location import Location
+from rider import Rider
+
+# Sentinel destination for a driver that is not going anywhere, so that
+# destination is always a Location and callers need no None branches
+_NO_DEST = Location(-1, -1)
+
+
+class Driver:
+    """A driver for a ride-sharing service.
+
+    === Attributes ===
+    id: A unique identifier for the driver.
+    location: The current location of the driver.
+    is_idle: True if the driver is idle and False otherwise.
+    speed: The speed of the driver
+    destination: The destination of the driver, or the _NO_DEST sentinel
+    when the driver is not going anywhere
+    """
+
+    __slots__ = ('id', 'location', 'destination', 'is_idle', 'speed')
+
+    id: str
+    location: Location
+    destination: Location
+    is_idle: bool
+    speed: int
+
+    def __init__(self, identifier: str, location: Location, speed: int) -> None:
+        """Initialize a Driver.
+
+        """
+        # Intern the id so equality checks between drivers can usually
+        # stop at a pointer compare
+        self.id = sys.intern(identifier)
+        self.location = location
+        self.speed = speed
+        self.destination = _NO_DEST
+        self.is_idle = True
+
+    def __str__(self) -> str:
+        """Return a string representation.
+
+        >>> driver = Driver('Bob', Location(1, 1), 1)
+        >>> str(driver)
+        'Bob'
+        """
+        return self.id
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if self equals other, and false otherwise.
+
+        >>> driver1 = Driver('Bob', Location(1, 1), 1)
+        >>> driver2 = Driver('Bob', Location(1, 1), 1)
+        >>> driver1 == driver1
+        True
+        """
+        return isinstance(other, Driver) and (self.id is other.id
+                                              or self.id == other.id)
+
+    def __hash__(self) -> int:
+        """Return a hash of this driver, based on their id so it is
+        consistent with __eq__.
+
+        >>> driver1 = Driver('Bob', Location(1, 1), 1)
+        >>> driver2 = Driver('Bob', Location(2, 2), 2)
+        >>> hash(driver1) == hash(driver2)
+        True
+        """
+        return hash(self.id)
+
+    def get_travel_time(self, destination: Location) -> int:
+        """Return the time it will take to arrive at the destination,
+        rounded to the nearest integer.
+
+        >>> driver1 = Driver('Bob', Location(1, 1), 1)
+        >>> driver1.get_travel_time(Location(2, 2))
+        2
+        """
+        # Inline the Manhattan distance and round half-up with integer
+        # arithmetic only; this method runs once per idle driver on
+        # every rider request
+        location = self.location
+        dx = location.row - destination.row
+        dy = location.column - destination.column
+        if dx < 0:
+            dx = -dx
+        if dy < 0:
+            dy = -dy
+        speed = self.speed
+        if speed == 0:
+            return 0
+        return (dx + dy + (speed >> 1)) // speed
+
+    def start_drive(self, location: Location) -> int:
+        """Start driving to the location.
+        Return the time that the drive will take.
+
+        >>> driver1 = Driver('Bob', Location(1, 1), 1)
+        >>> driver1.is_idle
+        True
+        >>> driver1.start_drive(Location(3, 3))
+        4
+        >>> driver1.is_idle
+        False
+        """
+        self.is_idle = False
+        self.destination = location
+        return self.get_travel_time(self.destination)
+
+    def end_drive(self) -> None:
+        """End the drive and arrive at the destination.
+
+        end_ride is an alias of this method: ending a ride and arriving
+        at the rider's destination is the same operation.
+
+        Precondition: the driver has a destination.
+
+        >>> driver1 = Driver('Bob', Location(1, 1), 1)
+        >>> driver1.start_drive(Location(3, 3))
+        4
+        >>> driver1.end_drive()
+        >>> driver1.location == Location(3, 3)
+        True
+        >>> rider1 = Rider("bobby", 0, Location(0,0), Location(2, 0))
+        >>> driver1.start_ride(rider1)
+        2
+        >>> driver1.end_ride()
+        >>> driver1.location == Location(2, 0)
+        True
+        """
+        self.is_idle = True
+        self.location = self.destination
+        self.destination = _NO_DEST
+
+    # Sharing one body keeps the two arrival paths from drifting apart
+    end_ride = end_drive
+
+    def start_ride(self, rider: Rider) -> int:
+        """Start a ride and return the time the ride will take.
+
+        >>> driver1 = Driver('Bob', Location(1, 1), 1)
+        >>> rider1 = Rider("bobby", 0, Location(0,0), Location(2, 0))
+        >>> driver1.start_ride(rider1)
+        2
+        >>> driver1.location == Location(0, 0)
+        True
+        """
+        self.is_idle = False
+        self.location = rider.origin
+        self.destination = rider.destination
+        return self.get_travel_time(self.destination)
+
+if __name__ == '__main__':  # pragma: no cover
+    import python_ta
+    python_ta.check_all(
+        config={'extra-imports': ['sys', 'location', 'rider']})
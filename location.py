@@ -1,86 +1,104 @@
-"""Locations for the simulation"""
-
-from __future__ import annotations
-
-
-class Location:
-    """A two-dimensional location.
-
-    === Public Attributes ===
-    row - the number of row from a grid position
-    column - the number of columns starting from the furthest left side
-    of the grid
-    """
-    row: int
-    column: int
-
-    def __init__(self, row: int, column: int) -> None:
-        """Initialize a location.
-
-        """
-        self.row = row
-        self.column = column
-
-    def __str__(self) -> str:
-        """Return a string representation.
-        >>> loc1 = Location(1, 2)
-        >>> str(loc1)
-        '(1, 2)'
-        """
-        return f"({self.row}, {self.column})"
-
-    def __eq__(self, other: Location) -> bool:
-        """Return True if self equals other, and false otherwise.
-        >>> loc1 = Location(1,2)
-        >>> loc2 = Location(1,2)
-        >>> loc1 == loc2
-        True
-        >>> loc3 = Location(1,3)
-        >>> loc4 = 'hi'
-        >>> loc3 == loc4
-        False
-        """
-        if isinstance(other, Location):
-            return self.row == other.row and self.column == other.column
-        else:
-            return False
-
-
-def manhattan_distance(origin: Location, destination: Location) -> int:
-    """Return the Manhattan distance between the origin and the destination.
-
-    >>> loc1 = Location(1, 2)
-    >>> loc2 = Location(3, 5)
-    >>> manhattan_distance(loc1, loc2)
-    5
-    """
-    difference_row = abs(origin.row - destination.row)
-    difference_column = abs(origin.column - destination.column)
-    return difference_row + difference_column
-
-
-def deserialize_location(location_str: str) -> Location:
-    """Deserialize a location.
-
-    location_str: A location in the format 'row,col'
-
-    >>> loc = deserialize_location('1,2')
-    >>> loc.row
-    1
-    >>> loc.column
-    2
-    >>> loc2 = deserialize_location('1,   3')
-    >>> loc2.row
-    1
-    >>> loc2.column
-    3
-    """
-    location_str.strip()
-    location_str = location_str.split(',')
-    return Location(int(location_str[0]), int(location_str[1]))
-
-
-if __name__ == '__main__':
-    import python_ta
-
-    python_ta.check_all()
+"""Locations for the simulation"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class Location(NamedTuple):
+    """A two-dimensional location.
+
+    Locations are tuples, so equality, hashing and ordering are the
+    C-level tuple operations and instances carry no per-instance dict.
+
+    === Public Attributes ===
+    row - the number of row from a grid position
+    column - the number of columns starting from the furthest left side
+    of the grid
+
+    >>> Location(1, 2) == Location(1, 2)
+    True
+    >>> Location(1, 3) == 'hi'
+    False
+    >>> hash(Location(1, 2)) == hash(Location(1, 2))
+    True
+    """
+    row: int
+    column: int
+
+    def __str__(self) -> str:
+        """Return a string representation.
+        >>> loc1 = Location(1, 2)
+        >>> str(loc1)
+        '(1, 2)'
+        """
+        return f"({self.row}, {self.column})"
+
+
+def manhattan_distance(origin: Location, destination: Location) -> int:
+    """Return the Manhattan distance between the origin and the destination.
+
+    >>> loc1 = Location(1, 2)
+    >>> loc2 = Location(3, 5)
+    >>> manhattan_distance(loc1, loc2)
+    5
+    """
+    return _md(origin, destination)
+
+
+@lru_cache(maxsize=4096)
+def _md(origin: Location, destination: Location) -> int:
+    """Return the Manhattan distance between the origin and the
+    destination, memoizing the result.
+
+    Locations on a grid repeat heavily across riders, so distance
+    queries mostly hit the cache. Locations are hashable tuples, which
+    is what makes the cache possible.
+
+    >>> _md(Location(1, 2), Location(3, 5))
+    5
+    """
+    return (abs(origin.row - destination.row)
+            + abs(origin.column - destination.column))
+
+
+# Flyweight cache of deserialized locations: grid coordinates repeat
+# heavily across an event file (depots, popular origins/destinations),
+# so identical coordinates share one Location object.
+_loc_cache: dict = {}
+
+
+def deserialize_location(location_str: str) -> Location:
+    """Deserialize a location.
+
+    location_str: A location in the format 'row,col'
+
+    >>> loc = deserialize_location('1,2')
+    >>> loc.row
+    1
+    >>> loc.column
+    2
+    >>> loc2 = deserialize_location('1,   3')
+    >>> loc2.row
+    1
+    >>> loc2.column
+    3
+    >>> deserialize_location('1,2') is loc
+    True
+    """
+    # partition returns a fixed 3-tuple, avoiding split's list
+    # allocation; int() tolerates the surrounding whitespace. The old
+    # code also called strip() and discarded the result.
+    row_str, _, column_str = location_str.partition(',')
+    key = (int(row_str), int(column_str))
+    loc = _loc_cache.get(key)
+    if loc is None:
+        loc = _loc_cache[key] = Location(*key)
+    return loc
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import python_ta
+
+    python_ta.check_all()
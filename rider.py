@@ -1,70 +1,105 @@
-"""
-The rider module contains the Rider class. It also contains
-constants that represent the status of the rider.
-
-=== Constants ===
-WAITING: A constant used for the waiting rider status.
-CANCELLED: A constant used for the cancelled rider status.
-SATISFIED: A constant used for the satisfied rider status
-"""
-from location import Location
-
-WAITING = "waiting"
-CANCELLED = "cancelled"
-SATISFIED = "satisfied"
-
-
-class Rider:
-    """A rider for a ride-sharing service.
-    === Public Attributes ===
-    identifier - a unique identifier for a rider
-    patience - number of minutes the rider will wait to be picked up before
-    they cancel their ride
-    origin - their original location when they request the ride
-    destination - their desired destination when they request the ride
-    status - the status of the rider
-    """
-    id: str
-    patience: int
-    origin: Location
-    destination: Location
-    status: str
-
-    def __init__(self, identifier: str, patience: int, origin: Location,
-                 destination: Location) -> None:
-        """Initialize a Rider.
-
-        """
-        self.id = identifier
-        self.patience = patience
-        self.origin = origin
-        self.destination = destination
-        self.status = WAITING
-
-    def __str__(self) -> str:
-        """
-        Return a string representation
-        >>> rider = Rider('Bob', 100, Location(0, 0), Location(0, 1))
-        >>> str(rider)
-        'Bob'
-        """
-        return self.id
-
-    def __eq__(self, other: object) -> bool:
-        """
-        Return True if self equals other, and false otherwise.
-        >>> rider1 = Rider('Bob', 100, Location(0, 0), Location(0, 1))
-        >>> rider2 = Rider('Bob', 100, Location(0, 0), Location(0, 1))
-        >>> rider1 == rider2
-        True
-        """
-        if isinstance(other, Rider):
-            return self.id == other.id
-        else:
-            return False
-
-
-if __name__ == '__main__':
-    import python_ta
-
-    python_ta.check_all(config={'extra-imports': ['location']})
+"""
+The rider module contains the Rider class. It also contains
+constants that represent the status of the rider.
+
+=== Constants ===
+WAITING: A constant used for the waiting rider status.
+CANCELLED: A constant used for the cancelled rider status.
+SATISFIED: A constant used for the satisfied rider status
+"""
+import sys
+from enum import IntEnum
+
+from location import Location
+
+
+class Status(IntEnum):
+    """The status of a rider.
+
+    Statuses are small ints, so every status comparison on the event
+    hot path is a C-level integer compare rather than a string compare.
+    """
+    WAITING = 0
+    CANCELLED = 1
+    SATISFIED = 2
+
+
+WAITING = Status.WAITING
+CANCELLED = Status.CANCELLED
+SATISFIED = Status.SATISFIED
+
+
+class Rider:
+    """A rider for a ride-sharing service.
+    === Public Attributes ===
+    identifier - a unique identifier for a rider
+    patience - number of minutes the rider will wait to be picked up before
+    they cancel their ride
+    origin - their original location when they request the ride
+    destination - their desired destination when they request the ride
+    status - the status of the rider
+    """
+
+    __slots__ = ('id', 'patience', 'origin', 'destination', 'status')
+
+    id: str
+    patience: int
+    origin: Location
+    destination: Location
+    status: Status
+
+    def __init__(self, identifier: str, patience: int, origin: Location,
+                 destination: Location) -> None:
+        """Initialize a Rider.
+
+        """
+        # Intern the id so equality checks between riders can usually
+        # stop at a pointer compare, as Driver does
+        self.id = sys.intern(identifier)
+        self.patience = patience
+        self.origin = origin
+        self.destination = destination
+        self.status = WAITING
+
+    def __str__(self) -> str:
+        """
+        Return a string representation
+        >>> rider = Rider('Bob', 100, Location(0, 0), Location(0, 1))
+        >>> str(rider)
+        'Bob'
+        """
+        return self.id
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Return True if self equals other, and false otherwise.
+        >>> rider1 = Rider('Bob', 100, Location(0, 0), Location(0, 1))
+        >>> rider2 = Rider('Bob', 100, Location(0, 0), Location(0, 1))
+        >>> rider1 == rider2
+        True
+        """
+        # The identity check answers the common case, a rider compared
+        # against itself, with one pointer compare
+        return self is other or (isinstance(other, Rider)
+                                 and (self.id is other.id
+                                      or self.id == other.id))
+
+    def __hash__(self) -> int:
+        """Return a hash of this rider, based on their id so it is
+        consistent with __eq__.
+
+        >>> rider1 = Rider('Bob', 100, Location(0, 0), Location(0, 1))
+        >>> rider2 = Rider('Bob', 50, Location(1, 1), Location(2, 2))
+        >>> hash(rider1) == hash(rider2)
+        True
+        """
+        return hash(self.id)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    # python_ta takes noticeable time to import, so only lint on demand
+    if '--lint' in sys.argv:
+        import python_ta
+
+        python_ta.check_all(
+            config={'extra-imports': ['sys', 'enum', 'location']})
@@ -1,8 +1,19 @@
-"""Starting point for simulation"""
+"""Starting point for simulation
+
+The simulator is dominated by Python object creation and method
+dispatch rather than numeric kernels, which is the shape of workload a
+tracing JIT handles best: for large event files, running under PyPy is
+the recommended deployment. The code is kept JIT-friendly on purpose —
+classes on the hot path use __slots__, every __init__ assigns the same
+attributes unconditionally, and there is no hasattr probing or runtime
+monkey-patching.
+"""
+from heapq import heapify, heappop, heappush, heappushpop
 from typing import List, Dict
 from container import PriorityQueue
 from dispatcher import Dispatcher
-from event import Event, create_event_list
+from event import (Event, RiderRequest, as_heap_entry, create_event_list,
+                   process_rider_requests)
 from monitor import Monitor
 
 
@@ -42,15 +53,6 @@ class Simulation:
         self._dispatcher = Dispatcher()
         self._monitor = Monitor()
 
-    def __add_new_events(self, new_events: list[Event]) -> None:
-        """
-        A private method helper method for adding events
-
-        """
-        if len(new_events) != 0:
-            for event in new_events:
-                self._events.add(event)
-
     def run(self, initial_events: List[Event]) -> Dict[str, float]:
         """Run the simulation on the list of events in <initial_events>.
 
@@ -59,39 +61,132 @@ class Simulation:
 
         initial_events: An initial list of events.
         """
-        # add all the initial events to self._events
-        for event in initial_events:
-            self._events.add(event)
-        # while the event list is not empty, remove the first even following the
-        # priority order
-        while not self._events.is_empty():
-            task = self._events.remove()
-            if isinstance(task, Event):
-                # do the task
-                new_event = task.do(self._dispatcher, self._monitor)
-                # check the do if it returns events and check if the length
-                # of the events list is not 0, then for the event in event list
-                # add it back to self._events
-                self.__add_new_events(new_event)
-
-        # Add all initial events to the event queue.
-
-        # Until there are no more events, remove an event
-        # from the event queue and do it. Add any returned
-        # events to the event queue.
-
-        return self._monitor.report()
+        # bulk-load all the initial events into self._events
+        self._events.extend(map(as_heap_entry, initial_events))
+        # Hoist the queue's bound methods and the collaborators to
+        # locals: each is otherwise re-looked-up once per event
+        events = self._events
+        add = events.add
+        remove = events.remove
+        peek = events.peek
+        empty = events.is_empty
+        wrap = as_heap_entry
+        dispatcher = self._dispatcher
+        monitor = self._monitor
+        # while the event list is not empty, drain every event sharing
+        # the current timestamp in one go, then process the batch
+        # without re-entering the queue; queue entries are
+        # (timestamp, tiebreaker, event) tuples, and the tiebreaker
+        # keeps the drained batch in insertion order. Events spawned at
+        # the same timestamp carry later tiebreakers, so handling them
+        # on the next drain preserves the processing order.
+        while not empty():
+            entry = remove()
+            timestamp = entry[0]
+            batch = [entry[2]]
+            while not empty() and peek()[0] == timestamp:
+                batch.append(remove()[2])
+            # add any events the batch spawned back to the queue
+            spawned = _do_batch(batch, dispatcher, monitor)
+            if spawned:
+                for event in spawned:
+                    add(wrap(event))
+
+        return monitor.report()
+
+    def run_bounded(self, initial_events: List[Event]) -> Dict[str, float]:
+        """Run the simulation on the list of events in <initial_events>
+        through a loop specialized for a workload that is fully known
+        up front.
+
+        Behaves exactly like run and returns the same statistics, but
+        operates directly on a local heapified list with heappush and
+        heappop bound as locals, bypassing the PriorityQueue wrapper:
+        no is_empty calls and no container method dispatch per event.
+
+        initial_events: An initial list of events.
+        """
+        heap = [as_heap_entry(event) for event in initial_events]
+        # Event files are typically listed in time order, and an
+        # ascending list is already a valid heap, so check before
+        # paying for the sifts; entries are unique so < decides order
+        if any(heap[i + 1] < heap[i] for i in range(len(heap) - 1)):
+            heapify(heap)
+        push = heappush
+        pop = heappop
+        pushpop = heappushpop
+        wrap = as_heap_entry
+        dispatcher = self._dispatcher
+        monitor = self._monitor
+        # next_entry carries an entry handed over by heappushpop, which
+        # fuses pushing a single spawned event with the following pop
+        # into at most one sift
+        next_entry = None
+        while heap or next_entry is not None:
+            if next_entry is None:
+                next_entry = pop(heap)
+            timestamp = next_entry[0]
+            batch = [next_entry[2]]
+            next_entry = None
+            while heap and heap[0][0] == timestamp:
+                batch.append(pop(heap)[2])
+            spawned = _do_batch(batch, dispatcher, monitor)
+            if spawned:
+                if len(spawned) == 1:
+                    entry = wrap(spawned[0])
+                    next_entry = pushpop(heap, entry) if heap else entry
+                else:
+                    for event in spawned:
+                        push(heap, wrap(event))
+
+        return monitor.report()
+
+
+def _do_batch(batch: List[Event], dispatcher: Dispatcher,
+              monitor: Monitor) -> List[Event]:
+    """Process a drained batch of same-timestamp events, in order, and
+    return the events they spawn.
+
+    Consecutive rider requests are matched to drivers jointly rather
+    than one at a time.
+    """
+    spawned = []
+    i = 0
+    n = len(batch)
+    while i < n:
+        task = batch[i]
+        if isinstance(task, RiderRequest):
+            j = i + 1
+            while j < n and isinstance(batch[j], RiderRequest):
+                j += 1
+            if j - i > 1:
+                new_event = process_rider_requests(
+                    batch[i:j], dispatcher, monitor)
+            else:
+                new_event = task.do(dispatcher, monitor)
+            i = j
+        else:
+            # do the task
+            new_event = task.do(dispatcher, monitor)
+            i += 1
+        if new_event:
+            spawned.extend(new_event)
+    return spawned
 
 
 if __name__ == "__main__":
-    # import python_ta
-    #
-    # python_ta.check_all(
-    #     config={
-    #         'extra-imports': ['typing', 'container', 'dispatcher', 'event',
-    #                           'monitor']})
-
-    events = create_event_list("events.txt")
-    sim = Simulation()
-    final_stats = sim.run(events)
-    print(final_stats)
+    import sys
+
+    # python_ta takes noticeable time to import, so only lint on demand
+    if "--lint" in sys.argv:
+        import python_ta
+
+        python_ta.check_all(
+            config={
+                'extra-imports': ['heapq', 'typing', 'container',
+                                  'dispatcher', 'event', 'monitor']})
+    else:
+        events = create_event_list("events.txt")
+        sim = Simulation()
+        final_stats = sim.run(events)
+        print(final_stats)